@@ -0,0 +1,291 @@
+# archive.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from player import Player
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id     INTEGER PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    ended_at    REAL,
+    nb_players  INTEGER NOT NULL,
+    nb_days     INTEGER NOT NULL,
+    winner      TEXT
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    game_id     INTEGER NOT NULL REFERENCES games(game_id),
+    player_id   INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    npc         INTEGER NOT NULL,
+    role        TEXT NOT NULL,
+    personality TEXT,
+    fate        TEXT NOT NULL,
+    death_day   INTEGER,
+    PRIMARY KEY (game_id, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS lines (
+    line_id     INTEGER PRIMARY KEY,
+    game_id     INTEGER NOT NULL REFERENCES games(game_id),
+    day         INTEGER NOT NULL,
+    speaker_id  INTEGER NOT NULL,
+    text        TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS votes (
+    game_id     INTEGER NOT NULL REFERENCES games(game_id),
+    day         INTEGER NOT NULL,
+    voter_id    INTEGER NOT NULL,
+    target_id   INTEGER NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(
+    text, content='lines', content_rowid='line_id'
+);
+
+CREATE INDEX IF NOT EXISTS idx_players_personality ON players(personality, role, fate);
+CREATE INDEX IF NOT EXISTS idx_players_role ON players(role, fate);
+CREATE INDEX IF NOT EXISTS idx_lines_speaker ON lines(game_id, speaker_id, day);
+CREATE INDEX IF NOT EXISTS idx_lines_day ON lines(day);
+CREATE INDEX IF NOT EXISTS idx_votes_game ON votes(game_id, day);
+CREATE INDEX IF NOT EXISTS idx_games_winner ON games(winner);
+"""
+
+
+class GameTranscript:
+    """
+    Journal d'une partie en cours : répliques, votes, morts et issue.
+    Rempli par le GameMaster, puis confié à un TranscriptArchive en fin de partie.
+    """
+
+    def __init__(self) -> None:
+        self.started_at: float = time.time()
+        self.ended_at: Optional[float] = None
+        self.nb_days: int = 0
+        self.winner: Optional[str] = None
+
+        self.players: Dict[int, Dict[str, Any]] = {}
+        self.lines: List[tuple] = []
+        self.votes: List[tuple] = []
+
+    def register_players(self, players: Iterable[Player]) -> None:
+        """Enregistre (ou met à jour) la fiche de chaque joueur : rôle, personnalité."""
+        for player in players:
+            entry = self.players.setdefault(
+                player.id, {"fate": "alive", "death_day": None}
+            )
+            entry.update(
+                name=player.name,
+                npc=player.npc,
+                role=player.role.value,
+                personality=getattr(player, "personality_name", "") or None,
+            )
+
+    def record_line(self, day: int, speaker: Player, text: str) -> None:
+        self.lines.append((day, speaker.id, text))
+
+    def record_vote(self, day: int, voter: Player, target: Player) -> None:
+        self.votes.append((day, voter.id, target.id))
+
+    def record_death(self, day: int, player: Player, fate: str) -> None:
+        """`fate` vaut "killed" (nuit) ou "lynched" (vote du village)."""
+        entry = self.players.setdefault(player.id, {})
+        entry["fate"] = fate
+        entry["death_day"] = day
+
+    def finish(self, winner: str, nb_days: int) -> None:
+        self.winner = winner
+        self.nb_days = nb_days
+        self.ended_at = time.time()
+
+
+class TranscriptArchive:
+    """
+    Stockage SQLite (FTS5) des parties terminées.
+
+    - add() met les parties en tampon et les écrit par lots de `batch_size`
+      dans une seule transaction (ingestion en masse de simulations).
+    - search_lines() interroge les répliques par personnalité, rôle, jour,
+      locuteur, destin du locuteur, vainqueur et texte plein.
+
+    Une même instance peut être partagée par des parties jouées en parallèle
+    dans plusieurs threads (connexion et tampon protégés par un verrou).
+    Entre processus, chacun ouvre sa propre instance sur le même fichier.
+    """
+
+    def __init__(self, path: str = "archive.sqlite3", batch_size: int = 100) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: List[GameTranscript] = []
+        self._lock = threading.RLock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    # ------------------------------------------------------ INGESTION
+
+    def add(self, transcript: GameTranscript) -> None:
+        with self._lock:
+            self._pending.append(transcript)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Écrit toutes les parties en attente dans une seule transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+
+            with self.conn:
+                for transcript in self._pending:
+                    self._insert_game(transcript)
+            self._pending = []
+
+    def _insert_game(self, transcript: GameTranscript) -> None:
+        cur = self.conn.execute(
+            "INSERT INTO games (started_at, ended_at, nb_players, nb_days, winner) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                transcript.started_at,
+                transcript.ended_at,
+                len(transcript.players),
+                transcript.nb_days,
+                transcript.winner,
+            ),
+        )
+        game_id = cur.lastrowid
+
+        self.conn.executemany(
+            "INSERT INTO players "
+            "(game_id, player_id, name, npc, role, personality, fate, death_day) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    game_id,
+                    player_id,
+                    info.get("name", ""),
+                    int(bool(info.get("npc"))),
+                    info.get("role", ""),
+                    info.get("personality"),
+                    info.get("fate", "alive"),
+                    info.get("death_day"),
+                )
+                for player_id, info in transcript.players.items()
+            ],
+        )
+
+        for day, speaker_id, text in transcript.lines:
+            cur = self.conn.execute(
+                "INSERT INTO lines (game_id, day, speaker_id, text) VALUES (?, ?, ?, ?)",
+                (game_id, day, speaker_id, text),
+            )
+            self.conn.execute(
+                "INSERT INTO lines_fts (rowid, text) VALUES (?, ?)",
+                (cur.lastrowid, text),
+            )
+
+        self.conn.executemany(
+            "INSERT INTO votes (game_id, day, voter_id, target_id) VALUES (?, ?, ?, ?)",
+            [(game_id, day, voter, target) for day, voter, target in transcript.votes],
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self.conn.close()
+
+    def __enter__(self) -> "TranscriptArchive":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------ REQUÊTES
+
+    def search_lines(
+        self,
+        text: Optional[str] = None,
+        personality: Optional[str] = None,
+        role: Optional[str] = None,
+        speaker: Optional[str] = None,
+        day: Optional[int] = None,
+        fate: Optional[str] = None,
+        fate_same_day: bool = False,
+        winner: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[sqlite3.Row]:
+        """
+        Recherche de répliques archivées. Tous les filtres sont optionnels.
+
+        - text          : requête FTS5 (ex. "loup NEAR suspect")
+        - fate          : destin du locuteur ("alive", "killed", "lynched")
+        - fate_same_day : ne garde que les répliques du jour de ce destin
+
+        Ex. toutes les répliques des loups "Troll du Village" qui ont fini lynchés :
+            archive.search_lines(role="Wolf", personality="Troll du Village", fate="lynched")
+        """
+        self.flush()
+
+        query = (
+            "SELECT l.game_id, l.day, p.name AS speaker, p.role, p.personality, "
+            "p.fate, p.death_day, g.winner, l.text "
+            "FROM lines l "
+            "JOIN players p ON p.game_id = l.game_id AND p.player_id = l.speaker_id "
+            "JOIN games g ON g.game_id = l.game_id"
+        )
+        where: List[str] = []
+        params: List[Any] = []
+
+        if text:
+            query += " JOIN lines_fts f ON f.rowid = l.line_id"
+            where.append("lines_fts MATCH ?")
+            params.append(text)
+        if personality:
+            where.append("p.personality = ?")
+            params.append(personality)
+        if role:
+            where.append("p.role = ?")
+            params.append(role)
+        if speaker:
+            where.append("p.name = ?")
+            params.append(speaker)
+        if day is not None:
+            where.append("l.day = ?")
+            params.append(day)
+        if fate:
+            where.append("p.fate = ?")
+            params.append(fate)
+            if fate_same_day:
+                where.append("l.day = p.death_day")
+        if winner:
+            where.append("g.winner = ?")
+            params.append(winner)
+
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY l.game_id, l.line_id LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def count_games(self, winner: Optional[str] = None) -> int:
+        self.flush()
+        with self._lock:
+            if winner:
+                row = self.conn.execute(
+                    "SELECT COUNT(*) FROM games WHERE winner = ?", (winner,)
+                ).fetchone()
+            else:
+                row = self.conn.execute("SELECT COUNT(*) FROM games").fetchone()
+        return row[0]
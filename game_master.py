@@ -1,14 +1,29 @@
 # game_master.py
 from __future__ import annotations
 
+import os
 import random
+import threading
+import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
 
-from player import Player, Wolf, Villager, Camp
-from llm_player import LLMVillager, LLMWolf, client, MODEL_NAME
+from archive import GameTranscript, TranscriptArchive
+from metrics import (
+    DAYS_PER_GAME,
+    GAMES_FINISHED,
+    GAMES_IN_PROGRESS,
+    LLM_FALLBACKS,
+    PHASE_DURATION,
+    REGISTRY,
+)
+from night import NightEngine
+from speaker_scheduler import SpeakerScheduler
+from player import Player, Wolf, Villager, Seer, Doctor, Camp, Role
+from llm_player import LLMVillager, LLMWolf, LLMSeer, LLMDoctor, dispatcher, transport
 from personalities import pick_personality_for_role, read_personality_text
 
 load_dotenv()
@@ -19,6 +34,20 @@ IA_NAMES_FALLBACK: List[str] = [
     "Franck", "Gina", "Hugo", "Irina",
 ]
 
+# Classe instanciée pour chaque rôle, côté humain et côté IA
+HUMAN_ROLE_CLASSES = {
+    Role.VILLAGER: Villager,
+    Role.WOLF: Wolf,
+    Role.SEER: Seer,
+    Role.DOCTOR: Doctor,
+}
+NPC_ROLE_CLASSES = {
+    Role.VILLAGER: LLMVillager,
+    Role.WOLF: LLMWolf,
+    Role.SEER: LLMSeer,
+    Role.DOCTOR: LLMDoctor,
+}
+
 
 class GameMaster:
     """
@@ -27,12 +56,21 @@ class GameMaster:
     - villagers     : sous-liste des villageois
     - wolves        : sous-liste des loups
     - human_player  : référence vers le joueur humain
+    - transcript    : journal de la partie (répliques, votes, morts, issue)
+    - archive       : stockage optionnel des parties terminées
     """
 
     NB_PLAYERS: int = 10
     NB_WOLVES: int = 2
-
-    def __init__(self, human_name: Optional[str] = None) -> None:
+    NB_SEERS: int = 1
+    NB_DOCTORS: int = 1
+    MAX_SPEAKERS_PER_DAY: int = 6
+
+    def __init__(
+        self,
+        human_name: Optional[str] = None,
+        archive: Optional[TranscriptArchive] = None,
+    ) -> None:
         self.players: List[Player] = []
         self.villagers: List[Player] = []
         self.wolves: List[Wolf] = []
@@ -43,9 +81,16 @@ class GameMaster:
         self.pending_human_vote: Optional[int] = None
 
         self.day_number: int = 0
+        self.night_engine = NightEngine()
+        self.speaker_scheduler = SpeakerScheduler(self.MAX_SPEAKERS_PER_DAY)
+        self.today_speakers: List[Player] = []
+
+        self.transcript = GameTranscript()
+        self.archive = archive
 
         self.setup_players(human_name)
         self.distribute_roles()
+        self.transcript.register_players(self.players)
 
     # ------------------------------------------------------------------ SETUP
 
@@ -78,7 +123,10 @@ class GameMaster:
             )
 
     def _generate_ia_names(self, count: int) -> List[str]:
-        """Génère `count` prénoms pour les IA via Groq (ou fallback)."""
+        """
+        Génère `count` prénoms pour les IA via Groq (ou fallback).
+        Les parties créées en même temps partagent un seul appel (dispatcher).
+        """
         system_prompt = (
             "You generate short, human first names suited for a social deduction game."
         )
@@ -88,18 +136,20 @@ class GameMaster:
         )
 
         try:
-            resp = client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
+            content = dispatcher.complete(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
                 ],
                 temperature=0.6,
                 max_tokens=60,
+                call_type="names",
             )
-            content = (resp.choices[0].message.content or "").strip()
             ia_names = [name.strip() for name in content.split(",") if name.strip()]
+            # la liste peut être partagée avec d'autres parties : on la mélange
+            random.shuffle(ia_names)
         except Exception:
+            LLM_FALLBACKS.inc(call_type="names")
             ia_names = IA_NAMES_FALLBACK.copy()
 
         while len(ia_names) < count:
@@ -109,8 +159,9 @@ class GameMaster:
 
     def distribute_roles(self) -> None:
         """
-        Attribue aléatoirement les rôles (Villageois / Loups) aux joueurs
-        et instancie les classes finales (Villager/Wolf/LLMVillager/LLMWolf).
+        Attribue aléatoirement les rôles (Villageois / Loups / Voyante / Médecin)
+        aux joueurs et instancie les classes finales (HUMAN_ROLE_CLASSES /
+        NPC_ROLE_CLASSES).
 
         - L'humain reçoit un rôle mais pas de personnalité IA.
         - Les IA reçoivent une personnalité en fonction de leur rôle.
@@ -121,57 +172,50 @@ class GameMaster:
         self.villagers = []
         self.wolves = []
 
-        for base_player, camp in zip(self.players, roles_list):
+        for base_player, role in zip(self.players, roles_list):
             if base_player.npc:
-                new_player = self._create_npc_with_role(base_player, camp)
+                new_player = self._create_npc_with_role(base_player, role)
             else:
-                new_player = self._create_human_with_role(base_player, camp)
+                new_player = self._create_human_with_role(base_player, role)
 
+            if new_player.camp == Camp.WOLF:
+                self.wolves.append(new_player)
+            else:
+                self.villagers.append(new_player)
             new_players.append(new_player)
 
         self.players = new_players
         self._link_wolves_together()
 
-    def _build_roles_list(self) -> List[Camp]:
-        nb_villagers = self.NB_PLAYERS - self.NB_WOLVES
-        roles_list = [Camp.VILLAGER] * nb_villagers + [Camp.WOLF] * self.NB_WOLVES
+    def _build_roles_list(self) -> List[Role]:
+        nb_villagers = self.NB_PLAYERS - self.NB_WOLVES - self.NB_SEERS - self.NB_DOCTORS
+        roles_list = (
+            [Role.VILLAGER] * nb_villagers
+            + [Role.WOLF] * self.NB_WOLVES
+            + [Role.SEER] * self.NB_SEERS
+            + [Role.DOCTOR] * self.NB_DOCTORS
+        )
         random.shuffle(roles_list)
         return roles_list
 
-    def _create_human_with_role(self, player: Player, camp: Camp) -> Player:
-        if camp == Camp.VILLAGER:
-            new_player = Villager(player_id=player.id, name=player.name, npc=False)
-            self.villagers.append(new_player)
-        else:
-            new_player = Wolf(player_id=player.id, name=player.name, npc=False)
-            self.wolves.append(new_player)
-
+    def _create_human_with_role(self, player: Player, role: Role) -> Player:
+        new_player = HUMAN_ROLE_CLASSES[role](
+            player_id=player.id, name=player.name, npc=False
+        )
         self.human_player = new_player
         return new_player
 
-    def _create_npc_with_role(self, player: Player, camp: Camp) -> Player:
-        role_name_for_persona = "Villager" if camp == Camp.VILLAGER else "Wolf"
-        personality = pick_personality_for_role(role_name_for_persona)
+    def _create_npc_with_role(self, player: Player, role: Role) -> Player:
+        personality = pick_personality_for_role(role.value)
         persona_text = read_personality_text(personality.context_path)
 
-        if camp == Camp.VILLAGER:
-            new_player = LLMVillager(
-                player_id=player.id,
-                name=player.name,
-                npc=True,
-                persona_text=persona_text,
-            )
-            self.villagers.append(new_player)
-        else:
-            new_player = LLMWolf(
-                player_id=player.id,
-                name=player.name,
-                npc=True,
-                persona_text=persona_text,
-            )
-            self.wolves.append(new_player)
-
-        return new_player
+        return NPC_ROLE_CLASSES[role](
+            player_id=player.id,
+            name=player.name,
+            npc=True,
+            persona_text=persona_text,
+            personality_name=personality.name,
+        )
 
     def _link_wolves_together(self) -> None:
         wolf_names = [wolf.name for wolf in self.wolves]
@@ -216,16 +260,29 @@ class GameMaster:
         print("=== Début de la partie Loup-Garou (mode texte) ===")
         print(f"Joueurs : {[player.name for player in self.players]}")
         if self.human_player:
-            print(f"Ton rôle : {self.human_player.camp.value}.")
+            print(f"Ton rôle : {self.human_player.role.value}.")
 
-        while self.game_state():
-            self.turn()
+        GAMES_IN_PROGRESS.inc()
+        try:
+            while self.game_state():
+                self.turn()
+        finally:
+            GAMES_IN_PROGRESS.dec()
 
         if len(self.alive_wolves()) == 0:
+            winner = Camp.VILLAGER
             print("\n🎉 Les villageois ont gagné !")
         else:
+            winner = Camp.WOLF
             print("\n🐺 Les loups ont gagné !")
 
+        GAMES_FINISHED.inc(winner=winner.value)
+        DAYS_PER_GAME.observe(self.day_number)
+
+        self.transcript.finish(winner.value, self.day_number)
+        if self.archive:
+            self.archive.add(self.transcript)
+
     # ------------------------------------------------------ UN TOUR COMPLET
 
     def turn(self) -> None:
@@ -234,6 +291,8 @@ class GameMaster:
         print(f"\n===== NUIT {self.day_number} =====")
         night_summary = self.night_phase()
         print(night_summary["text"])
+        for player in self.alive_players():
+            player.listen(f"Meneur: {night_summary['text']}")
 
         if not self.game_state():
             return
@@ -248,7 +307,7 @@ class GameMaster:
         """
         Lance la phase de nuit :
         - tous les joueurs dorment
-        - les loups choisissent une victime
+        - les rôles de nuit agissent (moteur de nuit : night.py)
         - tout le monde se réveille
         Retourne un dict { "victim_name": str | None, "text": str }.
         """
@@ -256,27 +315,31 @@ class GameMaster:
             player.night_reset()
             player.sleep()
 
-        wolves = self.alive_wolves()
-        villagers = self.alive_villagers()
-
-        if not wolves or not villagers:
+        if not self.alive_wolves() or not self.alive_villagers():
             for player in self.alive_players():
                 player.wake_up()
             return {"victim_name": None, "text": "Nuit calme, personne n'est mort."}
 
-        killer = wolves[0]
-        target = killer.night_action(villagers)
+        night = self.night_engine.run(self)
 
         victim_name: Optional[str] = None
-        if target:
-            target.alive = False
-            victim_name = target.name
+        for victim in night.deaths:
+            self.transcript.record_death(self.day_number, victim, "killed")
+        if night.deaths:
+            victim_name = ", ".join(victim.name for victim in night.deaths)
+
+        human = self.human_player
+        if human:
+            for message in night.private.get(human.id, []):
+                print(f"(secret) {message}")
 
         for player in self.alive_players():
             player.wake_up()
 
         if victim_name:
             text = f"Pendant la nuit, {victim_name} a été tué(e)."
+        elif night.victim:
+            text = "Les loups ont attaqué, mais leur victime a été sauvée cette nuit."
         else:
             text = "Nuit passée, personne n'est mort."
 
@@ -291,6 +354,10 @@ class GameMaster:
         """
         self.discussion()
         lynched = self.vote()
+        self.speaker_scheduler.end_day(
+            [player for player in self.alive_players() if player.npc],
+            self.today_speakers,
+        )
 
         if lynched:
             text = f"{lynched.name} est lynché(e) par le village."
@@ -301,25 +368,34 @@ class GameMaster:
     def discussion(self) -> None:
         """
         Discussion du jour en mode terminal :
-        - chaque IA parle via talk()
+        - au plus MAX_SPEAKERS_PER_DAY IA parlent via talk()
+          (choisies par le SpeakerScheduler)
         - l'humain peut taper un message
         Tout le monde écoute tout le monde.
         """
         alive = self.alive_players()
         human = self.human_player
 
+        npcs = [player for player in alive if player.npc]
+        speakers = self.speaker_scheduler.select(npcs)
+        self.today_speakers = speakers
+
         print("\n--- Début de la discussion du jour ---")
 
-        # Messages IA
-        for player in alive:
-            if player.npc:
-                text = player.talk()
-                if text:
-                    line = f"{player.name}: {text}"
-                    print(line)
-                    for other in alive:
-                        if other.id != player.id:
-                            other.listen(line)
+        # Messages IA (seule la partie IA est chronométrée, pas la saisie humaine)
+        started = time.perf_counter()
+        for player in speakers:
+            text = player.talk()
+            if text:
+                line = f"{player.name}: {text}"
+                print(line)
+                self.transcript.record_line(self.day_number, player, text)
+                self.speaker_scheduler.observe_line(player, text, alive)
+                player.said(text)
+                for other in alive:
+                    if other.id != player.id:
+                        other.listen(line)
+        PHASE_DURATION.observe(time.perf_counter() - started, phase="discussion")
 
         # Message humain
         if human and human.alive:
@@ -330,6 +406,9 @@ class GameMaster:
             if msg:
                 line = f"{human.name}: {msg}"
                 print(line)
+                self.transcript.record_line(self.day_number, human, msg)
+                self.speaker_scheduler.observe_line(human, msg, alive)
+                human.said(msg)
                 for player in alive:
                     if player.id != human.id:
                         player.listen(line)
@@ -341,7 +420,8 @@ class GameMaster:
         Phase de vote en mode terminal :
         - affiche les joueurs vivants
         - demande le vote de l'humain
-        - les IA votent via vote()
+        - les orateurs du jour et les IA citées votent via vote() (LLM, en parallèle),
+          les autres IA suivent le joueur le plus cité (_heuristic_vote)
         Retourne le joueur condamné, ou None.
         """
         alive = self.alive_players()
@@ -380,29 +460,77 @@ class GameMaster:
                     continue
 
                 votes.append(target.id)
+                self.transcript.record_vote(self.day_number, human, target)
                 break
 
-        # Votes IA
-        for player in alive:
-            if player.npc:
-                target = player.vote(alive)
-                if target:
-                    print(f"{player.name} vote contre {target.name}.")
-                    votes.append(target.id)
+        # Votes IA : seuls les orateurs du jour et les joueurs cités votent via
+        # le LLM (en parallèle, pool borné) ; les autres suivent le débat.
+        npcs = [player for player in alive if player.npc]
+        speaker_ids = {player.id for player in self.today_speakers}
+        llm_voters = [
+            player for player in npcs
+            if player.id in speaker_ids or self.speaker_scheduler.mentions_today(player)
+        ]
+        npc_votes: Dict[int, Optional[Player]] = {}
+        started = time.perf_counter()
+        if llm_voters:
+            workers = min(len(llm_voters), transport.pool_size)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                targets = pool.map(lambda player: player.vote(alive), llm_voters)
+                for player, target in zip(llm_voters, targets):
+                    npc_votes[player.id] = target
+        PHASE_DURATION.observe(time.perf_counter() - started, phase="vote")
+
+        for player in npcs:
+            if player.id in npc_votes:
+                target = npc_votes[player.id]
+            else:
+                target = self._heuristic_vote(player, alive)
+            if target:
+                print(f"{player.name} vote contre {target.name}.")
+                votes.append(target.id)
+                self.transcript.record_vote(self.day_number, player, target)
 
         if not votes:
             print("Personne n'a voté.")
             return None
 
         counts = Counter(votes)
+        self.speaker_scheduler.observe_votes(counts)
         condemned_id, _ = counts.most_common(1)[0]
         condemned = next(p for p in alive if p.id == condemned_id)
         condemned.alive = False
+        self.transcript.record_death(self.day_number, condemned, "lynched")
 
         print(f"\n=> {condemned.name} est condamné(e) par le village.")
         return condemned
 
+    def _heuristic_vote(self, player: Player, alive: List[Player]) -> Optional[Player]:
+        """Vote sans LLM : le joueur le plus cité du jour (jamais un coéquipier loup)."""
+        candidates = [p for p in alive if p.id != player.id]
+        mates = getattr(player, "mate_names", [])
+        candidates = [p for p in candidates if p.name not in mates] or candidates
+        if not candidates:
+            return None
+        return self.speaker_scheduler.most_cited(candidates) or random.choice(candidates)
+
 
 if __name__ == "__main__":
-    gm = GameMaster()
+    metrics_port = os.environ.get("WEREWOLF_METRICS_PORT")
+    if metrics_port:
+        REGISTRY.start_http_server(int(metrics_port))
+    metrics_dump = os.environ.get("WEREWOLF_METRICS_DUMP")
+    if metrics_dump:
+        REGISTRY.dump_on_exit(metrics_dump)
+
+    archive_path = os.environ.get("WEREWOLF_ARCHIVE")
+    archive = TranscriptArchive(archive_path, batch_size=1) if archive_path else None
+
+    # connexion TLS ouverte pendant que le joueur tape son pseudo
+    threading.Thread(target=transport.warm_up, daemon=True).start()
+
+    gm = GameMaster(archive=archive)
     gm.run_game()
+
+    if archive:
+        archive.close()
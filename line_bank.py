@@ -0,0 +1,226 @@
+# line_bank.py
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import random
+import re
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from personalities import PERSONALITIES_POOL, read_personality_text
+from player import Camp, Player, Role, mentions_name
+
+
+LINE_BANK_PATH = os.environ.get("WEREWOLF_LINE_BANK", "context/line_bank.json.gz")
+
+# "off"        : jamais de réplique pré-calculée
+# "low_stakes" : seulement pour les ouvertures et les réactions à une mort (défaut)
+# "prefer"     : dès que la situation est reconnue (accusé, défense compris)
+LINE_BANK_POLICY = os.environ.get("WEREWOLF_LINE_BANK_POLICY", "low_stakes")
+
+SITUATIONS: Dict[str, str] = {
+    "opening": "le début de la partie, tu prends la parole pour la première fois",
+    "accused": "quelqu'un vient de te citer ou de t'accuser, tu réagis",
+    "defending": "un joueur proche de toi est soupçonné, tu prends sa défense sans le nommer",
+    "post_death": "un villageois vient d'être retrouvé mort ce matin, tu réagis",
+}
+LOW_STAKES_SITUATIONS = ("opening", "post_death")
+
+ROLE_BRIEFS: Dict[Role, str] = {
+    Role.VILLAGER: "Tu es VILLAGEOIS, tu ne sais pas qui sont les loups.",
+    Role.WOLF: "Tu es secrètement LOUP : tu parais innocent et ne le révèles jamais.",
+    Role.SEER: "Tu es VOYANTE, tu restes discrète sur tes visions.",
+    Role.DOCTOR: "Tu es MÉDECIN, tu restes discret sur tes protections.",
+}
+
+
+def _key(personality: str, role: str, situation: str) -> str:
+    return f"{personality}|{role}|{situation}"
+
+
+class LineBank:
+    """
+    Banque de répliques pré-générées, indexée par personnalité / rôle / situation.
+
+    Fichier : JSON gzip { "lines": [...], "index": { "perso|rôle|situation": [i, ...] } }
+    draw() évite de resservir les répliques tirées récemment pour la même clé.
+    """
+
+    def __init__(self, lines: Optional[List[str]] = None,
+                 index: Optional[Dict[str, List[int]]] = None) -> None:
+        self.lines: List[str] = lines or []
+        self.index: Dict[str, List[int]] = index or {}
+        self._recent: Dict[str, Deque[int]] = {}
+
+    @classmethod
+    def load(cls, path: str = LINE_BANK_PATH) -> "LineBank":
+        """Charge la banque ; banque vide si le fichier n'existe pas."""
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        return cls(data.get("lines", []), data.get("index", {}))
+
+    def save(self, path: str = LINE_BANK_PATH) -> None:
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(
+                {"lines": self.lines, "index": self.index},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+
+    def add(self, personality: str, role: str, situation: str, lines: List[str]) -> None:
+        offsets = self.index.setdefault(_key(personality, role, situation), [])
+        for line in lines:
+            offsets.append(len(self.lines))
+            self.lines.append(line)
+
+    def draw(self, personality: str, role: str, situation: str) -> Optional[str]:
+        key = _key(personality, role, situation)
+        offsets = self.index.get(key)
+        if not offsets:
+            return None
+
+        recent = self._recent.setdefault(key, deque(maxlen=max(1, len(offsets) // 2)))
+        fresh = [i for i in offsets if i not in recent] or offsets
+        choice = random.choice(fresh)
+        recent.append(choice)
+        return self.lines[choice]
+
+
+_line_bank: Optional[LineBank] = None
+
+
+def get_line_bank() -> LineBank:
+    global _line_bank
+    if _line_bank is None:
+        _line_bank = LineBank.load()
+    return _line_bank
+
+
+# ------------------------------------------------------ SITUATION COURANTE
+
+def detect_situation(player: Player) -> Optional[str]:
+    """
+    Déduit la situation du joueur à partir de son historique :
+    - accused    : son nom est cité dans les dernières répliques du jour
+    - defending  : (loup) un coéquipier est cité dans ces répliques
+    - opening    : premier jour, le joueur n'a pas encore parlé de la partie
+    - post_death : le joueur n'a pas encore parlé aujourd'hui et une mort a été annoncée
+    Renvoie None si la réplique dépend vraiment du contexte.
+    """
+    today: List[str] = []
+    for entry in reversed(player.history):
+        if entry == "Se réveille.":
+            break
+        today.append(entry)
+    today.reverse()
+
+    # on retire "Entendu: " et le nom du locuteur pour ne garder que le texte dit
+    heard_today = [
+        e[len("Entendu: "):].partition(": ")[2]
+        for e in today
+        if e.startswith("Entendu: ") and not e.startswith("Entendu: Meneur:")
+    ]
+
+    recent = " ".join(heard_today[-3:])
+    if recent:
+        if mentions_name(recent, player.name):
+            return "accused"
+        mates = getattr(player, "mate_names", [])
+        if player.camp == Camp.WOLF and any(mentions_name(recent, m) for m in mates):
+            return "defending"
+
+    spoke_today = any(e.startswith("Dit: ") for e in today)
+    spoke_ever = any(e.startswith("Dit: ") for e in player.history)
+    first_day = player.history.count("Se réveille.") <= 1
+
+    if first_day and not spoke_ever:
+        return "opening"
+    if not spoke_today and any(
+        e.startswith("Entendu: Meneur:") and "tué" in e for e in today
+    ):
+        return "post_death"
+    return None
+
+
+def draw_banked_line(player: Player) -> Optional[str]:
+    """Réplique pré-calculée si la politique et la situation le permettent."""
+    if LINE_BANK_POLICY == "off":
+        return None
+
+    personality = getattr(player, "personality_name", "")
+    if not personality:
+        return None
+
+    situation = detect_situation(player)
+    if situation is None:
+        return None
+    if LINE_BANK_POLICY == "low_stakes" and situation not in LOW_STAKES_SITUATIONS:
+        return None
+
+    return get_line_bank().draw(personality, player.role.value, situation)
+
+
+# ------------------------------------------------------ GÉNÉRATION HORS LIGNE
+
+def _parse_lines(content: str) -> List[str]:
+    lines = []
+    for raw in content.splitlines():
+        line = re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", raw).strip().strip('"')
+        if line:
+            lines.append(line)
+    return lines
+
+
+def build_line_bank(path: str = LINE_BANK_PATH, lines_per_key: int = 8) -> LineBank:
+    """
+    Génère la banque pour chaque personnalité × rôle × situation via Groq,
+    puis l'écrit dans `path`. À lancer hors partie : python line_bank.py
+    """
+    from llm_player import dispatcher
+
+    bank = LineBank()
+    for personality in PERSONALITIES_POOL:
+        persona_text = read_personality_text(personality.context_path)
+        for role in Role:
+            for situation, description in SITUATIONS.items():
+                system_prompt = (
+                    "Tu écris des répliques pour un joueur IA du Loup-Garou.\n"
+                    f"- {ROLE_BRIEFS[role]}\n"
+                    f"- Ta personnalité et ton style de parole :\n{persona_text}\n"
+                )
+                user_prompt = (
+                    f"Situation : {description}.\n"
+                    f"Écris {lines_per_key} répliques différentes, en français, "
+                    "UNE phrase courte chacune, une par ligne, sans numérotation "
+                    "et sans citer de prénom."
+                )
+                try:
+                    content = dispatcher.complete(
+                        [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        temperature=0.9,
+                        max_tokens=60 * lines_per_key,
+                        call_type="bank",
+                    )
+                except Exception:
+                    print(f"Échec : {personality.name} / {role.value} / {situation}")
+                    continue
+
+                lines = _parse_lines(content)[:lines_per_key]
+                bank.add(personality.name, role.value, situation, lines)
+                print(f"{personality.name} / {role.value} / {situation} : {len(lines)} répliques")
+
+    bank.save(path)
+    return bank
+
+
+if __name__ == "__main__":
+    build_line_bank()
@@ -0,0 +1,127 @@
+# llm_dispatcher.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from metrics import LLM_COALESCED, LLM_LATENCY, LLM_WAIT
+
+
+Messages = List[Dict[str, str]]
+CompletionFn = Callable[[Messages, float, int], str]
+
+
+class LLMDispatcher:
+    """
+    Couche placée sous ask_llm, partagée par toutes les parties du processus.
+
+    - Single-flight : deux requêtes identiques en vol (mêmes messages, mêmes
+      paramètres) ne donnent qu'un seul appel HTTP ; les suivantes attendent
+      le résultat de la première.
+    - Fenêtre de regroupement : pour certains types d'appel (ex. "names"),
+      le premier demandeur attend `windows[call_type]` secondes avant
+      d'envoyer la requête, pour que les parties créées au même moment
+      s'y greffent.
+    - stats() donne le nombre de requêtes, d'appels réels et le taux de
+      coalescence par type d'appel.
+    """
+
+    def __init__(
+        self,
+        completion_fn: CompletionFn,
+        windows: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.completion_fn = completion_fn
+        self.windows: Dict[str, float] = dict(windows or {})
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[Any, ...], Future] = {}
+        self._requests: Dict[str, int] = {}
+        self._calls: Dict[str, int] = {}
+
+    def complete(
+        self,
+        messages: Messages,
+        temperature: float,
+        max_tokens: int,
+        call_type: str = "talk",
+    ) -> str:
+        """
+        Renvoie le texte de la complétion. Les exceptions de l'appel sont
+        propagées à tous les demandeurs regroupés.
+        """
+        started = time.perf_counter()
+        try:
+            return self._complete(messages, temperature, max_tokens, call_type)
+        finally:
+            LLM_WAIT.observe(time.perf_counter() - started, call_type=call_type)
+
+    def _complete(
+        self,
+        messages: Messages,
+        temperature: float,
+        max_tokens: int,
+        call_type: str,
+    ) -> str:
+        key = (
+            call_type,
+            temperature,
+            max_tokens,
+            json.dumps(messages, ensure_ascii=False, sort_keys=True),
+        )
+
+        with self._lock:
+            self._requests[call_type] = self._requests.get(call_type, 0) + 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            LLM_COALESCED.inc(call_type=call_type)
+            return future.result()
+
+        window = self.windows.get(call_type, 0.0)
+        if window > 0:
+            time.sleep(window)
+
+        with self._lock:
+            self._calls[call_type] = self._calls.get(call_type, 0) + 1
+
+        started = time.perf_counter()
+        try:
+            result = self.completion_fn(messages, temperature, max_tokens)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - started, call_type=call_type)
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Statistiques par type d'appel : requests, calls, coalesced, hit_rate."""
+        with self._lock:
+            report: Dict[str, Dict[str, float]] = {}
+            for call_type, requests in self._requests.items():
+                calls = self._calls.get(call_type, 0)
+                coalesced = requests - calls
+                report[call_type] = {
+                    "requests": requests,
+                    "calls": calls,
+                    "coalesced": coalesced,
+                    "hit_rate": coalesced / requests if requests else 0.0,
+                }
+            return report
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._calls.clear()
@@ -3,10 +3,13 @@ from typing import List, Optional
 import os
 import random
 
-from groq import Groq
 from dotenv import load_dotenv
 
-from player import Villager, Wolf, Player
+from line_bank import draw_banked_line
+from llm_dispatcher import LLMDispatcher, Messages
+from metrics import LLM_FALLBACKS, VOTE_RANDOM_FALLBACKS
+from player import Villager, Wolf, Seer, Doctor, Player
+from transport import GroqTransport
 
 load_dotenv()
 
@@ -14,50 +17,90 @@ GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
 if not GROQ_API_KEY:
     raise EnvironmentError("GROQ_API_KEY manquante dans le .env")
 
-client = Groq(api_key=GROQ_API_KEY)
+transport = GroqTransport(GROQ_API_KEY)
 MODEL_NAME = "llama-3.3-70b-versatile"
 
+# Fenêtre (en secondes) pendant laquelle les demandes de prénoms des parties
+# créées simultanément sont regroupées en un seul appel.
+NAMES_BATCH_WINDOW = float(os.environ.get("WEREWOLF_NAMES_BATCH_WINDOW", "0.05"))
 
-def ask_llm(system_prompt: str, user_prompt: str) -> str:
+
+def _create_completion(messages: Messages, temperature: float, max_tokens: int) -> str:
+    with transport.in_flight():
+        resp = transport.client().chat.completions.create(
+            model=MODEL_NAME,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+    return (resp.choices[0].message.content or "").strip()
+
+
+dispatcher = LLMDispatcher(_create_completion, windows={"names": NAMES_BATCH_WINDOW})
+
+
+def ask_llm(system_prompt: str, user_prompt: str, call_type: str = "talk") -> str:
     """Wrapper unique pour appeler le LLM."""
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
     try:
-        resp = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=80,
+        return dispatcher.complete(
+            messages, temperature=0.7, max_tokens=80, call_type=call_type
         )
-        return (resp.choices[0].message.content or "").strip()
     except Exception:
+        LLM_FALLBACKS.inc(call_type=call_type)
         return "Je ne suis pas sûr, mais je trouve ce joueur un peu suspect."
 
 
+def ask_llm_for_player(
+    system_prompt: str,
+    user_prompt: str,
+    candidates: List[Player],
+    call_type: str = "night",
+) -> Optional[Player]:
+    """Demande un NOM au LLM et renvoie le joueur correspondant (ou None)."""
+    choice_name = ask_llm(system_prompt, user_prompt, call_type=call_type)
+    return next((p for p in candidates if p.name.lower() == choice_name.lower()), None)
+
+
 class LLMVillager(Villager):
     """Villageois IA contrôlé par LLM, avec personnalité."""
 
+    ROLE_PROMPT = "VILLAGEOIS"
+
     def __init__(
         self,
         player_id: int,
         name: str,
         npc: bool,
         persona_text: str = "",
+        personality_name: str = "",
     ) -> None:
         super().__init__(player_id, name, npc)
         self.persona_text = persona_text or ""
+        self.personality_name = personality_name or ""
+
+    def role_instructions(self) -> str:
+        """Consignes propres au rôle spécial (vide pour un simple villageois)."""
+        return ""
 
     def talk(self) -> str:
+        # répliques de faible enjeu (ouverture, réaction à une mort) : banque hors ligne
+        banked = draw_banked_line(self)
+        if banked:
+            return banked
+
         last_msgs = "\n".join(self.history[-6:]) if self.history else "Début de la partie."
         system_prompt = (
-            "Tu joues au jeu du Loup-Garou en tant que VILLAGEOIS.\n"
+            f"Tu joues au jeu du Loup-Garou en tant que {self.ROLE_PROMPT}.\n"
             "- Tu NE sais PAS qui sont les loups.\n"
             "- Tu te bases uniquement sur ce que tu entends.\n"
             "- Tu veux aider le village à trouver les loups.\n"
             "- Parle en français, en UNE SEULE phrase courte et naturelle.\n"
         )
+        system_prompt += self.role_instructions()
         if self.persona_text:
             system_prompt += (
                 "- Ta personnalité et ton style de parole sont décrits ici :\n"
@@ -84,11 +127,12 @@ class LLMVillager(Villager):
         last_msgs = "\n".join(self.history[-6:]) if self.history else "Début de la partie."
 
         system_prompt = (
-            "Tu joues au Loup-Garou en tant que VILLAGEOIS.\n"
+            f"Tu joues au Loup-Garou en tant que {self.ROLE_PROMPT}.\n"
             "- Tu ne sais pas qui sont les loups.\n"
             "- Tu dois choisir pour qui voter à la fin du débat.\n"
             "- Tu dois te baser uniquement sur ce que tu as entendu.\n"
         )
+        system_prompt += self.role_instructions()
         if self.persona_text:
             system_prompt += (
                 "- Ta personnalité et ton style sont décrits ici :\n"
@@ -100,8 +144,10 @@ class LLMVillager(Villager):
             f"Les joueurs encore vivants sont : {list_str}.\n"
             "Réponds UNIQUEMENT par le NOM D'UN JOUEUR que tu trouves le plus suspect."
         )
-        choice_name = ask_llm(system_prompt, user_prompt)
+        choice_name = ask_llm(system_prompt, user_prompt, call_type="vote")
         target = next((p for p in candidates if p.name.lower() == choice_name.lower()), None)
+        if target is None:
+            VOTE_RANDOM_FALLBACKS.inc(role=self.role.value)
 
         return target or random.choice(candidates)
 
@@ -118,12 +164,19 @@ class LLMWolf(Wolf):
         name: str,
         npc: bool,
         persona_text: str = "",
+        personality_name: str = "",
     ) -> None:
         super().__init__(player_id, name, npc)
         self.mate_names: List[str] = []
         self.persona_text = persona_text or ""
+        self.personality_name = personality_name or ""
 
     def talk(self) -> str:
+        # répliques de faible enjeu (ouverture, réaction à une mort) : banque hors ligne
+        banked = draw_banked_line(self)
+        if banked:
+            return banked
+
         last_msgs = "\n".join(self.history[-6:]) if self.history else "Début de la partie."
         mates_info = ", ".join(self.mate_names) if self.mate_names else "aucun"
 
@@ -185,16 +238,102 @@ class LLMWolf(Wolf):
             "Réponds UNIQUEMENT par le NOM D'UN JOUEUR que tu souhaites voir éliminé, "
             "en évitant de viser tes coéquipiers."
         )
-        choice_name = ask_llm(system_prompt, user_prompt)
+        choice_name = ask_llm(system_prompt, user_prompt, call_type="vote")
         target = next((p for p in usable if p.name.lower() == choice_name.lower()), None)
+        if target is None:
+            VOTE_RANDOM_FALLBACKS.inc(role=self.role.value)
 
         return target or random.choice(usable)
 
     def night_action(self, villagers: List[Player]) -> Optional[Player]:
-        """Choix de la victime la nuit (simple pour l'instant)"""
-        if not villagers:
+        """Proposition de victime pour la meute (le consensus est fait par le moteur de nuit)."""
+        possibles = [v for v in villagers if v.alive]
+        if not possibles:
+            return None
+
+        list_str = ", ".join(p.name for p in possibles)
+        last_msgs = "\n".join(self.history[-6:]) if self.history else "Début de la partie."
+        mates_info = ", ".join(self.mate_names) if self.mate_names else "aucun"
+
+        system_prompt = (
+            "Tu joues au Loup-Garou en tant que LOUP, c'est la nuit.\n"
+            f"- Tes coéquipiers loups sont : {mates_info}.\n"
+            "- Vous devez choisir ensemble une victime parmi les villageois.\n"
+            "- Vise en priorité les joueurs dangereux pour la meute (accusateurs, rôles suspectés).\n"
+        )
+        user_prompt = (
+            f"Historique récent :\n{last_msgs}\n\n"
+            f"Les victimes possibles sont : {list_str}.\n"
+            "Réponds UNIQUEMENT par le NOM du joueur à dévorer cette nuit."
+        )
+        target = ask_llm_for_player(system_prompt, user_prompt, possibles)
+
+        return target or random.choice(possibles)
+
+
+class LLMSeer(LLMVillager, Seer):
+    """Voyante IA : ses visions sont injectées dans ses prompts."""
+
+    ROLE_PROMPT = "VOYANTE (camp des villageois)"
+
+    def role_instructions(self) -> str:
+        visions = " ".join(self.visions) if self.visions else "aucune pour l'instant"
+        return (
+            "- Chaque nuit, tu découvres le camp d'un joueur.\n"
+            f"- Tes visions (SECRÈTES) : {visions}\n"
+            "- Oriente le village vers les loups sans te dévoiler trop tôt.\n"
+        )
+
+    def night_action(self, candidates: List[Player]) -> Optional[Player]:
+        possibles = [p for p in candidates if p.alive and p.id != self.id]
+        if not possibles:
+            return None
+
+        list_str = ", ".join(p.name for p in possibles)
+        last_msgs = "\n".join(self.history[-6:]) if self.history else "Début de la partie."
+        system_prompt = (
+            "Tu joues au Loup-Garou en tant que VOYANTE, c'est la nuit.\n"
+            + self.role_instructions()
+            + "- Choisis le joueur dont tu veux découvrir le camp.\n"
+        )
+        user_prompt = (
+            f"Historique récent :\n{last_msgs}\n\n"
+            f"Les joueurs que tu peux sonder sont : {list_str}.\n"
+            "Réponds UNIQUEMENT par le NOM D'UN JOUEUR."
+        )
+        target = ask_llm_for_player(system_prompt, user_prompt, possibles)
+
+        return target or random.choice(possibles)
+
+
+class LLMDoctor(LLMVillager, Doctor):
+    """Médecin IA : protège un joueur chaque nuit."""
+
+    ROLE_PROMPT = "MÉDECIN (camp des villageois)"
+
+    def role_instructions(self) -> str:
+        return (
+            "- Chaque nuit, tu protèges un joueur contre l'attaque des loups.\n"
+            "- Tu ne peux pas protéger la même personne deux nuits de suite.\n"
+        )
+
+    def night_action(self, candidates: List[Player]) -> Optional[Player]:
+        possibles = self.protectable(candidates)
+        if not possibles:
             return None
-        # On garde un comportement simple/variable
-        if random.random() < 0.5:
-            return random.choice(villagers)
-        return random.choice(villagers)
+
+        list_str = ", ".join(p.name for p in possibles)
+        last_msgs = "\n".join(self.history[-6:]) if self.history else "Début de la partie."
+        system_prompt = (
+            "Tu joues au Loup-Garou en tant que MÉDECIN, c'est la nuit.\n"
+            + self.role_instructions()
+            + "- Protège le joueur le plus menacé ou le plus utile au village.\n"
+        )
+        user_prompt = (
+            f"Historique récent :\n{last_msgs}\n\n"
+            f"Les joueurs que tu peux protéger sont : {list_str}.\n"
+            "Réponds UNIQUEMENT par le NOM D'UN JOUEUR."
+        )
+        target = ask_llm_for_player(system_prompt, user_prompt, possibles)
+
+        return target or random.choice(possibles)
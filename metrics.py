@@ -0,0 +1,259 @@
+# metrics.py
+from __future__ import annotations
+
+import atexit
+import sys
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    TYPE = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names: Tuple[str, ...] = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.TYPE}",
+        ]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Compteur monotone."""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Valeur instantanée (peut monter et descendre)."""
+
+    TYPE = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Histogramme à seaux fixes (cumulatifs au rendu, comme Prometheus)."""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        names = self.label_names + ("le",)
+        for key, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble des métriques du processus, rendu au format texte Prometheus."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    # ------------------------------------------------------ EXPORT
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Sert /metrics sur un port local, dans un thread démon."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def dump_on_exit(self, path: Optional[str] = None) -> None:
+        """À la sortie du processus, écrit les métriques dans `path` ("-" = stderr)."""
+
+        def dump() -> None:
+            text = self.render()
+            if not path or path == "-":
+                sys.stderr.write(text)
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+
+        atexit.register(dump)
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_LATENCY = REGISTRY.histogram(
+    "werewolf_llm_request_seconds",
+    "Latence des appels réellement envoyés au LLM, par type d'appel.",
+    labels=("call_type",),
+)
+LLM_WAIT = REGISTRY.histogram(
+    "werewolf_llm_wait_seconds",
+    "Attente vue par l'appelant (fenêtre de regroupement et coalescence comprises).",
+    labels=("call_type",),
+)
+LLM_FALLBACKS = REGISTRY.counter(
+    "werewolf_llm_fallback_total",
+    "Appels LLM en échec remplacés par une réponse de secours.",
+    labels=("call_type",),
+)
+LLM_COALESCED = REGISTRY.counter(
+    "werewolf_llm_coalesced_total",
+    "Requêtes LLM servies par un appel identique déjà en vol.",
+    labels=("call_type",),
+)
+VOTE_RANDOM_FALLBACKS = REGISTRY.counter(
+    "werewolf_vote_random_fallback_total",
+    "Votes IA tirés au hasard faute de nom valide dans la réponse du LLM.",
+    labels=("role",),
+)
+GAMES_IN_PROGRESS = REGISTRY.gauge(
+    "werewolf_games_in_progress",
+    "Parties en cours dans ce processus.",
+)
+GAMES_FINISHED = REGISTRY.counter(
+    "werewolf_games_finished_total",
+    "Parties terminées, par camp vainqueur.",
+    labels=("winner",),
+)
+PHASE_DURATION = REGISTRY.histogram(
+    "werewolf_phase_seconds",
+    "Durée de la partie IA des phases (night, discussion, vote), saisies humaines exclues.",
+    labels=("phase",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+DAYS_PER_GAME = REGISTRY.histogram(
+    "werewolf_days_per_game",
+    "Nombre de jours joués par partie.",
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20),
+)
@@ -0,0 +1,228 @@
+# night.py
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from metrics import PHASE_DURATION
+from player import Player, Role
+
+if TYPE_CHECKING:
+    from game_master import GameMaster
+
+
+class NightState:
+    """
+    Résultat en cours de construction pendant la résolution de la nuit.
+    - protected_ids : joueurs protégés par le médecin
+    - victim        : cible retenue par la meute (avant protection)
+    - deaths        : joueurs effectivement morts
+    - private       : messages privés par id de joueur (visions, etc.)
+    """
+
+    def __init__(self) -> None:
+        self.protected_ids: set = set()
+        self.victim: Optional[Player] = None
+        self.deaths: List[Player] = []
+        self.private: Dict[int, List[str]] = {}
+
+    def tell(self, player: Player, message: str) -> None:
+        self.private.setdefault(player.id, []).append(message)
+
+
+class NightAction(ABC):
+    """
+    Plug-in d'action de nuit pour un rôle.
+
+    - ask_human() : choix d'un acteur humain, demandé au terminal AVANT les
+                    décisions des IA (qui tournent en parallèle).
+    - decide()    : choix d'un acteur IA ; appelé EN PARALLÈLE pour tous les
+                    acteurs de tous les rôles, ne doit donc rien modifier.
+    - resolve()   : applique les décisions, dans l'ordre croissant de `priority`.
+    """
+
+    role: Role
+    priority: int = 0
+    human_prompt: str = "choisis un joueur"
+
+    def actors(self, gm: "GameMaster") -> List[Player]:
+        return [p for p in gm.alive_players() if p.role == self.role]
+
+    def candidates(self, gm: "GameMaster", actor: Player) -> List[Player]:
+        return gm.alive_players()
+
+    def decide(self, gm: "GameMaster", actor: Player) -> Optional[Player]:
+        return actor.night_action(self.candidates(gm, actor))
+
+    def ask_human(self, gm: "GameMaster", actor: Player) -> Optional[Player]:
+        candidates = self.candidates(gm, actor)
+        if not candidates:
+            return None
+
+        print(f"\n(nuit) {actor.name}, {self.human_prompt} :")
+        for player in candidates:
+            print(f"  {player.id}: {player.name}")
+
+        while True:
+            choice = input("Entre l'id du joueur (ou Enter pour passer) :\n> ").strip()
+            if choice == "":
+                return None
+            if not choice.isdigit():
+                print("Merci d'entrer un nombre valide.")
+                continue
+
+            target_id = int(choice)
+            target = next((p for p in candidates if p.id == target_id), None)
+            if not target:
+                print("Cible invalide. Réessaie.")
+                continue
+            return target
+
+    @abstractmethod
+    def resolve(
+        self,
+        gm: "GameMaster",
+        decisions: Dict[int, Optional[Player]],
+        state: NightState,
+    ) -> None:
+        ...
+
+
+NIGHT_ACTIONS: List[NightAction] = []
+
+
+def register_night_action(action: NightAction) -> NightAction:
+    """Ajoute un plug-in au moteur de nuit par défaut."""
+    NIGHT_ACTIONS.append(action)
+    return action
+
+
+class DoctorProtection(NightAction):
+    role = Role.DOCTOR
+    priority = 10
+    human_prompt = "qui veux-tu protéger cette nuit ? (pas le même que la nuit dernière)"
+
+    def candidates(self, gm, actor) -> List[Player]:
+        return actor.protectable(gm.alive_players())
+
+    def resolve(self, gm, decisions, state) -> None:
+        for actor in self.actors(gm):
+            target = decisions.get(actor.id)
+            if target:
+                actor.protect(target)
+                state.protected_ids.add(target.id)
+                state.tell(actor, f"Tu protèges {target.name} cette nuit.")
+            else:
+                # nuit sans protection : plus personne n'est bloqué la nuit suivante
+                actor.last_protected_id = None
+
+
+class WolfPackKill(NightAction):
+    """
+    Chaque loup propose une victime ; la meute retient la plus citée.
+    Égalité : le joueur d'id le plus petit parmi les ex-aequo.
+    """
+
+    role = Role.WOLF
+    priority = 20
+    human_prompt = "quelle victime proposes-tu à la meute ?"
+
+    def candidates(self, gm, actor) -> List[Player]:
+        return gm.alive_villagers()
+
+    def resolve(self, gm, decisions, state) -> None:
+        proposals = [t for t in decisions.values() if t is not None]
+        if not proposals:
+            return
+
+        counts = Counter(t.id for t in proposals)
+        best = max(counts.values())
+        victim_id = min(pid for pid, n in counts.items() if n == best)
+        victim = next(t for t in proposals if t.id == victim_id)
+
+        state.victim = victim
+        for wolf in self.actors(gm):
+            if wolf.id in decisions:
+                wolf.history.append(f"La meute cible {victim.name}.")
+                state.tell(wolf, f"La meute a choisi {victim.name}.")
+
+        if victim.id not in state.protected_ids:
+            state.deaths.append(victim)
+
+
+class SeerReveal(NightAction):
+    role = Role.SEER
+    priority = 30
+    human_prompt = "de quel joueur veux-tu découvrir le camp ?"
+
+    def candidates(self, gm, actor) -> List[Player]:
+        return [p for p in gm.alive_players() if p.id != actor.id]
+
+    def resolve(self, gm, decisions, state) -> None:
+        for actor in self.actors(gm):
+            target = decisions.get(actor.id)
+            if target:
+                state.tell(actor, f"Vision : {actor.receive_vision(target)}")
+
+
+register_night_action(DoctorProtection())
+register_night_action(WolfPackKill())
+register_night_action(SeerReveal())
+
+
+class NightEngine:
+    """
+    Déroule une nuit :
+    1. l'humain, s'il a un rôle de nuit, choisit au terminal ;
+    2. toutes les décisions IA (tous rôles, tous acteurs) sont prises en
+       parallèle → la nuit dure ~1 latence LLM quel que soit le nombre de rôles ;
+    3. résolution déterministe, plug-in par plug-in, par priorité.
+    """
+
+    def __init__(self, actions: Optional[List[NightAction]] = None) -> None:
+        self.actions = sorted(
+            actions if actions is not None else NIGHT_ACTIONS,
+            key=lambda action: action.priority,
+        )
+
+    def run(self, gm: "GameMaster") -> NightState:
+        state = NightState()
+
+        tasks = [
+            (action, actor)
+            for action in self.actions
+            for actor in action.actors(gm)
+        ]
+        decisions: Dict[int, Dict[int, Optional[Player]]] = {
+            id(action): {} for action in self.actions
+        }
+
+        # choix humains d'abord (terminal), pour ne pas allonger la phase parallèle
+        npc_tasks = []
+        for action, actor in tasks:
+            if actor.npc:
+                npc_tasks.append((action, actor))
+            else:
+                decisions[id(action)][actor.id] = action.ask_human(gm, actor)
+
+        started = time.perf_counter()
+        if npc_tasks:
+            with ThreadPoolExecutor(max_workers=len(npc_tasks)) as pool:
+                futures = [
+                    (action, actor, pool.submit(action.decide, gm, actor))
+                    for action, actor in npc_tasks
+                ]
+                for action, actor, future in futures:
+                    decisions[id(action)][actor.id] = future.result()
+        PHASE_DURATION.observe(time.perf_counter() - started, phase="night")
+
+        for action in self.actions:
+            action.resolve(gm, decisions[id(action)], state)
+
+        for player in state.deaths:
+            player.alive = False
+
+        return state
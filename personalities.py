@@ -5,11 +5,15 @@ from typing import List, Optional
 
 
 class Personality:
-    """Décrit une personnalité IA avec un nom et un chemin de contexte texte."""
+    """
+    Décrit une personnalité IA avec un nom et un chemin de contexte texte.
+    `talkativeness` (1.0 = normal) pèse sur le choix des orateurs du jour.
+    """
 
-    def __init__(self, name: str, context_path: str) -> None:
+    def __init__(self, name: str, context_path: str, talkativeness: float = 1.0) -> None:
         self.name = name
         self.context_path = context_path
+        self.talkativeness = talkativeness
 
     def __repr__(self) -> str:
         return f"Personality({self.name})"
@@ -18,28 +22,28 @@ class Personality:
 # POOL GLOBAL DE PERSONNALITÉS
 PERSONALITIES_POOL: List[Personality] = [
     # Sérieux / stratégiques
-    Personality("Enquêteur Froid", "context/perso_enqueteur_froid.txt"),
+    Personality("Enquêteur Froid", "context/perso_enqueteur_froid.txt", talkativeness=0.8),
     Personality("Analyste Logique", "context/perso_analyste_logique.txt"),
     Personality("Capitaine de Police", "context/perso_capitaine_police.txt"),
     Personality("Avocat de la Défense", "context/perso_avocat_defense.txt"),
-    Personality("Procureur Agressif", "context/perso_procureur_agressif.txt"),
+    Personality("Procureur Agressif", "context/perso_procureur_agressif.txt", talkativeness=1.4),
 
     # Mystiques / occultes
     Personality("Médium Mystique", "context/perso_medium_mystique.txt"),
     Personality("Médium Cynique", "context/perso_medium_cynique.txt"),
-    Personality("Occultiste Fatigué", "context/perso_occultiste_fatigue.txt"),
+    Personality("Occultiste Fatigué", "context/perso_occultiste_fatigue.txt", talkativeness=0.7),
 
     # Réseaux sociaux / drama
-    Personality("Streameuse Drama", "context/perso_streameuse_drama.txt"),
-    Personality("Influenceuse Insta", "context/perso_influenceuse_insta.txt"),
+    Personality("Streameuse Drama", "context/perso_streameuse_drama.txt", talkativeness=1.5),
+    Personality("Influenceuse Insta", "context/perso_influenceuse_insta.txt", talkativeness=1.3),
     Personality("Tiktokeuse Occulte", "context/perso_tiktokeuse_occulte.txt"),
     Personality("Community Manager", "context/perso_community_manager.txt"),
 
     # Comiques / chaotiques
     Personality("Comique de Service", "context/perso_comique_service.txt"),
-    Personality("Meme Lord", "context/perso_meme_lord.txt"),
-    Personality("Drama Queen", "context/perso_drama_queen.txt"),
-    Personality("Troll du Village", "context/perso_troll_village.txt"),
+    Personality("Meme Lord", "context/perso_meme_lord.txt", talkativeness=1.3),
+    Personality("Drama Queen", "context/perso_drama_queen.txt", talkativeness=1.5),
+    Personality("Troll du Village", "context/perso_troll_village.txt", talkativeness=1.4),
 
     # Intellos / vieux sages
     Personality("Philosophe Existentialiste", "context/perso_philosophe_existentialiste.txt"),
@@ -51,11 +55,11 @@ PERSONALITIES_POOL: List[Personality] = [
     Personality("Journaliste d'Investigation", "context/perso_journaliste_investigation.txt"),
     Personality("Journaliste à Scandales", "context/perso_journaliste_scandales.txt"),
     Personality("Cowboy Nerveux", "context/perso_cowboy_nerveux.txt"),
-    Personality("Vétéran de Guerre", "context/perso_veteran_guerre.txt"),
-    Personality("Naïf", "context/perso_naif.txt"),
+    Personality("Vétéran de Guerre", "context/perso_veteran_guerre.txt", talkativeness=0.8),
+    Personality("Naïf", "context/perso_naif.txt", talkativeness=0.8),
     Personality("Sceptique", "context/perso_sceptique.txt"),
-    Personality("Timide", "context/perso_timide.txt"),
-    Personality("Blagueur Lourd", "context/perso_blagueur_lourd.txt"),
+    Personality("Timide", "context/perso_timide.txt", talkativeness=0.5),
+    Personality("Blagueur Lourd", "context/perso_blagueur_lourd.txt", talkativeness=1.3),
 ]
 
 
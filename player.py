@@ -1,6 +1,7 @@
 # player.py
 from __future__ import annotations
 
+import re
 from enum import Enum
 from typing import List, Optional
 
@@ -10,6 +11,18 @@ class Camp(Enum):
     WOLF = "Wolf"
 
 
+class Role(Enum):
+    VILLAGER = "Villager"
+    WOLF = "Wolf"
+    SEER = "Seer"
+    DOCTOR = "Doctor"
+
+
+def mentions_name(text: str, name: str) -> bool:
+    """True si `name` apparaît comme mot entier dans `text` (casse ignorée)."""
+    return re.search(rf"(?<!\w){re.escape(name)}(?!\w)", text, re.IGNORECASE) is not None
+
+
 class Player:
     """
     Représente un joueur (humain ou IA).
@@ -20,6 +33,7 @@ class Player:
         self.name: str = name
         self.npc: bool = npc
         self.camp: Camp = camp
+        self.role: Role = Role(camp.value)
 
         self.alive: bool = True
         self.history: List[str] = []
@@ -39,6 +53,9 @@ class Player:
     def listen(self, message: str) -> None:
         self.history.append(f"Entendu: {message}")
 
+    def said(self, message: str) -> None:
+        self.history.append(f"Dit: {message}")
+
     # Parole / vote
 
     def talk(self) -> str:
@@ -82,3 +99,52 @@ class Villager(Player):
 
     def __init__(self, player_id: int, name: str, npc: bool) -> None:
         super().__init__(player_id=player_id, name=name, npc=npc, camp=Camp.VILLAGER)
+
+
+class Seer(Villager):
+    """Voyante : chaque nuit, découvre le camp d'un joueur."""
+
+    def __init__(self, player_id: int, name: str, npc: bool) -> None:
+        super().__init__(player_id=player_id, name=name, npc=npc)
+        self.role = Role.SEER
+        self.visions: List[str] = []
+
+    def night_action(self, candidates: List[Player]) -> Optional[Player]:
+        possibles = [p for p in candidates if p.alive and p.id != self.id]
+        if not possibles:
+            return None
+
+        import random
+
+        return random.choice(possibles)
+
+    def receive_vision(self, target: Player) -> str:
+        vision = f"{target.name} est {'un LOUP' if target.camp == Camp.WOLF else 'villageois'}."
+        self.visions.append(vision)
+        self.history.append(f"Vision: {vision}")
+        return vision
+
+
+class Doctor(Villager):
+    """Médecin : chaque nuit, protège un joueur (pas deux fois de suite le même)."""
+
+    def __init__(self, player_id: int, name: str, npc: bool) -> None:
+        super().__init__(player_id=player_id, name=name, npc=npc)
+        self.role = Role.DOCTOR
+        self.last_protected_id: Optional[int] = None
+
+    def protectable(self, candidates: List[Player]) -> List[Player]:
+        return [p for p in candidates if p.alive and p.id != self.last_protected_id]
+
+    def night_action(self, candidates: List[Player]) -> Optional[Player]:
+        possibles = self.protectable(candidates)
+        if not possibles:
+            return None
+
+        import random
+
+        return random.choice(possibles)
+
+    def protect(self, target: Player) -> None:
+        self.last_protected_id = target.id
+        self.history.append(f"Protège {target.name}.")
@@ -0,0 +1,97 @@
+# speaker_scheduler.py
+from __future__ import annotations
+
+import random
+from typing import Dict, Iterable, List, Optional
+
+from personalities import get_personality_by_name
+from player import Player, mentions_name
+
+
+class SpeakerStats:
+    """État d'un joueur pour le choix des orateurs, conservé d'un jour à l'autre."""
+
+    def __init__(self) -> None:
+        self.days_silent: int = 0
+        self.mentions: int = 0          # fois où il a été cité aujourd'hui
+        self.last_mentions: int = 0     # fois où il a été cité la veille
+        self.votes_received: int = 0    # votes reçus au dernier vote
+
+
+class SpeakerScheduler:
+    """
+    Choisit au plus `max_speakers` IA qui parlent chaque jour, pour que le
+    coût de la discussion reste O(k) quel que soit le nombre de joueurs.
+
+    Score d'un joueur :
+    - cité / accusé la veille        → il a besoin de se défendre
+    - votes reçus la veille          → il est au centre du débat
+    - jours passés sans parler       → équité entre les jours
+    - bavardage de sa personnalité   → un Timide parle moins qu'une Drama Queen
+    - un peu de hasard pour départager
+    """
+
+    MENTION_WEIGHT: float = 2.0
+    VOTE_WEIGHT: float = 1.0
+    SILENCE_WEIGHT: float = 1.5
+    JITTER: float = 0.5
+
+    def __init__(self, max_speakers: int) -> None:
+        self.max_speakers = max_speakers
+        self.stats: Dict[int, SpeakerStats] = {}
+
+    def _stats(self, player: Player) -> SpeakerStats:
+        return self.stats.setdefault(player.id, SpeakerStats())
+
+    def _talkativeness(self, player: Player) -> float:
+        personality = get_personality_by_name(getattr(player, "personality_name", ""))
+        return personality.talkativeness if personality else 1.0
+
+    def score(self, player: Player) -> float:
+        stats = self._stats(player)
+        return (
+            self.MENTION_WEIGHT * stats.last_mentions
+            + self.VOTE_WEIGHT * stats.votes_received
+            + self.SILENCE_WEIGHT * stats.days_silent
+            + self._talkativeness(player)
+            + random.uniform(0, self.JITTER)
+        )
+
+    def select(self, candidates: Iterable[Player]) -> List[Player]:
+        """Renvoie les orateurs du jour, les plus prioritaires en premier."""
+        ranked = sorted(candidates, key=self.score, reverse=True)
+        return ranked[: self.max_speakers]
+
+    # ------------------------------------------------------ OBSERVATIONS
+
+    def observe_line(self, speaker: Player, text: str, players: Iterable[Player]) -> None:
+        """Compte les joueurs cités (mot entier) dans une réplique."""
+        for player in players:
+            if player.id != speaker.id and mentions_name(text, player.name):
+                self._stats(player).mentions += 1
+
+    def mentions_today(self, player: Player) -> int:
+        return self._stats(player).mentions
+
+    def most_cited(self, candidates: List[Player]) -> Optional[Player]:
+        """Le candidat le plus cité aujourd'hui (hasard entre ex-aequo), ou None."""
+        best = max((self.mentions_today(p) for p in candidates), default=0)
+        if best == 0:
+            return None
+        return random.choice([p for p in candidates if self.mentions_today(p) == best])
+
+    def observe_votes(self, votes_by_target: Dict[int, int]) -> None:
+        for player_id, stats in self.stats.items():
+            stats.votes_received = votes_by_target.get(player_id, 0)
+
+    def end_day(self, candidates: Iterable[Player], speakers: Iterable[Player]) -> None:
+        """Met à jour le silence de chacun et bascule les citations du jour sur la veille."""
+        spoken_ids = {player.id for player in speakers}
+        for player in candidates:
+            stats = self._stats(player)
+            if player.id in spoken_ids:
+                stats.days_silent = 0
+            else:
+                stats.days_silent += 1
+            stats.last_mentions = stats.mentions
+            stats.mentions = 0
@@ -0,0 +1,162 @@
+# transport.py
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+from groq import Groq
+
+try:  # HTTP/2 seulement si le paquet h2 est installé (pip install "httpx[http2]")
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+POOL_SIZE = int(os.environ.get("WEREWOLF_HTTP_POOL_SIZE", "20"))
+KEEPALIVE_CONNECTIONS = int(os.environ.get("WEREWOLF_HTTP_KEEPALIVE", str(POOL_SIZE)))
+KEEPALIVE_EXPIRY = float(os.environ.get("WEREWOLF_HTTP_KEEPALIVE_EXPIRY", "60"))
+USE_HTTP2 = HTTP2_AVAILABLE and os.environ.get("WEREWOLF_HTTP2", "1") != "0"
+
+
+class TransportStats:
+    """Compteurs de la couche HTTP : réutilisation des connexions, saturation du pool."""
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.new_connections: int = 0
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.saturated_requests: int = 0
+
+    def as_dict(self, pool_size: int) -> Dict[str, float]:
+        reused = max(0, self.requests - self.new_connections)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_rate": reused / self.requests if self.requests else 0.0,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "pool_size": pool_size,
+            "saturated_requests": self.saturated_requests,
+        }
+
+
+class GroqTransport:
+    """
+    Fournit un client Groq par processus, avec un pool HTTP réglé :
+    taille du pool, keep-alive, HTTP/2 si disponible.
+
+    - client() recrée le client après un fork (les sockets du parent ne
+      doivent pas être partagées avec les workers).
+    - warm_up() ouvre la connexion TLS avant la première vraie requête.
+    - stats() expose réutilisation des connexions et saturation du pool :
+      les ouvertures de connexion sont comptées via l'extension publique
+      "trace" de httpx, la saturation via in_flight() autour des appels.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        pool_size: int = POOL_SIZE,
+        keepalive_connections: int = KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+        http2: bool = USE_HTTP2,
+    ) -> None:
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.keepalive_connections = keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+
+        self._lock = threading.Lock()
+        self._client: Optional[Groq] = None
+        self._http_client: Optional[httpx.Client] = None
+        self._pid: Optional[int] = None
+        self._stats = TransportStats()
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._forget_client)
+
+    # ------------------------------------------------------ CLIENT
+
+    def client(self) -> Groq:
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                self._build_client()
+            return self._client
+
+    def _build_client(self) -> None:
+        self._http_client = httpx.Client(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            event_hooks={"request": [self._on_request]},
+        )
+        self._client = Groq(api_key=self.api_key, http_client=self._http_client)
+        self._pid = os.getpid()
+
+    def _forget_client(self) -> None:
+        # dans le fils : on abandonne le client du parent sans le fermer
+        self._lock = threading.Lock()
+        self._client = None
+        self._http_client = None
+        self._pid = None
+        self._stats = TransportStats()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._http_client is not None and self._pid == os.getpid():
+                self._http_client.close()
+            self._client = None
+            self._http_client = None
+            self._pid = None
+
+    def warm_up(self) -> bool:
+        """Établit la connexion (DNS + TLS) via une requête légère. False en cas d'échec."""
+        try:
+            self.client().models.list()
+            return True
+        except Exception:
+            return False
+
+    # ------------------------------------------------------ STATISTIQUES
+
+    @contextmanager
+    def in_flight(self) -> Iterator[None]:
+        """Entoure un appel au client pour mesurer la saturation du pool."""
+        with self._lock:
+            stats = self._stats
+            if stats.in_flight >= self.pool_size:
+                stats.saturated_requests += 1
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                stats.in_flight -= 1
+
+    def _on_request(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = self._trace
+        with self._lock:
+            self._stats.requests += 1
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._stats.new_connections += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            report = self._stats.as_dict(self.pool_size)
+        report["http2"] = self.http2
+        return report